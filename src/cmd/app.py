@@ -0,0 +1,443 @@
+from flask import Flask, Response, g, render_template, request, make_response, abort, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask.logging import default_handler
+from flask_caching import Cache
+from jinja2 import FileSystemBytecodeCache
+from logging.handlers import QueueHandler, QueueListener
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from functools import wraps
+from typing import NamedTuple
+import atexit
+import hashlib
+import logging
+import orjson
+import os
+import queue
+import sys
+import threading
+import time
+
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+template_dir = os.path.join(base_dir, 'views')
+static_dir = os.path.join(base_dir, 'css')
+
+# Writes that bypass the API (mongosh, other deployments) do not bump the
+# collection version, so the GET /api/books payload is only reused for this long (seconds)
+BOOKS_PAYLOAD_MAX_AGE = 0.1
+
+# How books are stored and exposed by the API. The app is built for one schema:
+#   fields       (API key, stored field) pairs
+#   required     API keys a new book must have
+#   unique_field stored field with a unique index; a duplicate answers 409
+#   path_field   stored field /api/books/<book_id> refers to ("_id" = the MongoDB ObjectId)
+#   start_data   books seeded on startup, matched on unique_field
+class BookSchema(NamedTuple):
+    fields: tuple
+    required: frozenset
+    unique_field: str
+    path_field: str
+    start_data: tuple
+
+# The API described in README.md: books are addressed by their own ID
+id_schema = BookSchema(
+    fields=(
+        ("id", "ID"),
+        ("title", "BookName"),
+        ("author", "BookAuthor"),
+        ("edition", "BookEdition"),
+        ("pages", "BookPages"),
+        ("year", "BookYear"),
+    ),
+    required=frozenset(("id", "title", "author")),
+    unique_field="ID",
+    path_field="ID",
+    start_data=(
+        {
+            "ID": "example1",
+            "BookName": "The Vortex",
+            "BookAuthor": "José Eustasio Rivera",
+            "BookEdition": "958-30-0804-4",
+            "BookPages": "292",
+            "BookYear": "1924",
+        },
+        {
+            "ID": "example2",
+            "BookName": "Frankenstein",
+            "BookAuthor": "Mary Shelley",
+            "BookEdition": "978-3-649-64609-9",
+            "BookPages": "280",
+            "BookYear": "1818",
+        },
+        {
+            "ID": "example3",
+            "BookName": "The Black Cat",
+            "BookAuthor": "Edgar Allan Poe",
+            "BookEdition": "978-3-99168-238-7",
+            "BookPages": "280",
+            "BookYear": "1843",
+        },
+    ),
+)
+
+# The BookStore API served in production (exercise-2): books keep their stored
+# keys, are unique by ISBN and are addressed by their MongoDB _id
+isbn_schema = BookSchema(
+    fields=(
+        ("BookName", "BookName"),
+        ("BookAuthor", "BookAuthor"),
+        ("BookISBN", "BookISBN"),
+        ("BookPages", "BookPages"),
+        ("BookYear", "BookYear"),
+    ),
+    required=frozenset(("BookName", "BookAuthor", "BookISBN", "BookPages", "BookYear")),
+    unique_field="BookISBN",
+    path_field="_id",
+    start_data=(
+        {
+            "BookName": "The Vortex",
+            "BookAuthor": "José Eustasio Rivera",
+            "BookISBN": "958-30-0804-4",
+            "BookPages": 292,
+            "BookYear": 1924,
+        },
+        {
+            "BookName": "Frankenstein",
+            "BookAuthor": "Mary Shelley",
+            "BookISBN": "978-3-649-64609-9",
+            "BookPages": 280,
+            "BookYear": 1818,
+        },
+        {
+            "BookName": "The Black Cat",
+            "BookAuthor": "Edgar Allan Poe",
+            "BookISBN": "978-3-99168-238-7",
+            "BookPages": 280,
+            "BookYear": 1843,
+        },
+    ),
+)
+
+# Only the stored fields the book table uses, without _id
+def table_projection(schema):
+    return {"_id": 0, **{field: 1 for _, field in schema.fields}}
+
+# Stored books mapped to the API shape, missing fields defaulting to "";
+# the book identifier is always returned as a string
+def api_projection(schema):
+    projection = {key: {"$ifNull": [f"${field}", ""]} for key, field in schema.fields}
+    if schema.path_field == "_id":
+        projection["_id"] = {"$toString": "$_id"}
+    else:
+        projection["_id"] = 0
+        for key, field in schema.fields:
+            if field == schema.path_field:
+                projection[key] = {"$toString": projection[key]}
+    return projection
+
+# Serialize JSON responses and parse request bodies with orjson. Calls with
+# json options, and values orjson rejects (such as non-str dict keys), fall
+# back to Flask's default provider, so the output matches it either way
+class OrjsonProvider(DefaultJSONProvider):
+    def encode(self, obj):
+        # Dates and dataclasses go through Flask's default() like they do in Flask
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return super().dumps(obj).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else args or kwargs or None
+        return self._app.response_class(self.encode(obj), mimetype=self.mimetype)
+
+# One client, and therefore one connection pool, per process. PyMongo clients are
+# not fork-safe: under gunicorn keep preload off so each worker connects after the fork.
+def connect(mongo_uri):
+    client = MongoClient(
+        mongo_uri,
+        maxPoolSize=200,
+        minPoolSize=20,
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=3000,
+        compressors="zstd,snappy,zlib",
+        zlibCompressionLevel=3,
+        retryWrites=True,
+        )
+    atexit.register(client.close)
+    return client
+
+# Request handlers only put log records on a queue; a background listener
+# does the formatting and the (locking) stream write. All apps share the
+# "app" logger, so the handler and its listener are set up once per process.
+def use_queue_logging(app):
+    if any(isinstance(handler, QueueHandler) for handler in app.logger.handlers):
+        return
+
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(default_handler.formatter)
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    app.logger.removeHandler(default_handler)
+    app.logger.addHandler(QueueHandler(log_queue))
+
+# Index the unique book key so duplicate checks do not scan the collection,
+# and the grouped fields so authors/years come straight from the index
+def prepare_indexes(collection, schema):
+    try:
+        collection.create_index(schema.unique_field, unique=True)
+    except OperationFailure as e:
+        # Books already sharing the key make the unique index impossible to build
+        if e.code != 11000:
+            raise
+        sys.exit(f"Cannot create the unique index on '{schema.unique_field}': {(e.details or {}).get('errmsg', e)}. "
+                 "Remove the duplicate books, then restart.")
+    collection.create_index("BookAuthor")
+    collection.create_index("BookYear")
+
+# Populate the database on startup; returns the BulkWriteResult
+def prepare_data(collection, schema):
+    # One round trip; the upsert only inserts books whose key is not present yet
+    key = schema.unique_field
+    return collection.bulk_write(
+        [UpdateOne({key: book[key]}, {"$setOnInsert": book}, upsert=True) for book in schema.start_data],
+        ordered=False,
+    )
+
+# Distinct non-empty values of a field, grouped and sorted by MongoDB
+def find_distinct_sorted(collection, field):
+    pipeline = [
+        {"$match": {field: {"$nin": [None, ""]}}},
+        {"$group": {"_id": f"${field}"}},
+        {"$sort": {"_id": 1}},
+    ]
+    return [doc["_id"] for doc in collection.aggregate(pipeline)]
+
+# Retrieve all books as stored (without _id); the template reads the stored keys
+def find_all_books(collection, projection, batch_size=200):
+    return collection.find({}, projection).batch_size(batch_size)
+
+# Retrieve all books in the API shape; MongoDB renames the fields
+def find_all_api_books(collection, projection, batch_size=1000):
+    pipeline = [{"$project": projection}]
+    return list(collection.aggregate(pipeline, batchSize=batch_size))
+
+# Build the book store app on the given database, storing and serving books
+# as described by schema. db_name defaults to the database named in the URI;
+# pass client to inject an existing MongoClient, seed=False to skip start_data.
+def create_app(mongo_uri, db_name=None, coll_name="information", client=None, schema=id_schema, seed=True):
+    app = Flask(__name__, template_folder=template_dir, static_folder=static_dir, static_url_path="/css")
+    app.json = OrjsonProvider(app)
+    # Book bodies are tiny; refuse oversized requests (413) before reading them
+    app.config["MAX_CONTENT_LENGTH"] = 16 * 1024
+    # Keep compiled templates on disk so they are parsed once, not per process start
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    use_queue_logging(app)
+
+    # In-process cache for the rarely changing views, keyed by collection version
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 60})
+
+    # MongoDB Setup
+    if client is None:
+        client = connect(mongo_uri)
+    db = client[db_name] if db_name else client.get_default_database()
+    collection = db[coll_name]
+    # Write counter of the book collection, shared by all processes
+    versions = db["versions"]
+
+    # Record a write: bump the version. Cached views of older versions are no
+    # longer looked up and simply expire; deleting them here would race with a
+    # concurrent render that read the old data and stores it after the delete
+    def books_changed():
+        versions.update_one({"_id": "books"}, {"$inc": {"count": 1}}, upsert=True)
+
+    prepare_indexes(collection, schema)
+    # Every worker seeds on boot, so a seed book deleted through the API comes
+    # back whenever a worker starts; other workers' cached views must see it
+    if seed and prepare_data(collection, schema).upserted_count:
+        books_changed()
+
+    books_projection = table_projection(schema)
+    api_books_projection = api_projection(schema)
+    # API key of the field addressed by /api/books/<book_id> (None for _id)
+    path_key = next((key for key, field in schema.fields if field == schema.path_field), None)
+    unique_key = next(key for key, field in schema.fields if field == schema.unique_field)
+
+    # Filter selecting the book addressed by /api/books/<book_id>
+    def book_filter(book_id):
+        if schema.path_field != "_id":
+            return {schema.path_field: book_id}
+        try:
+            return {"_id": ObjectId(book_id)}
+        except InvalidId:
+            abort(400, description="Invalid Book ID format.")
+
+    # Current version of the book collection
+    def books_version():
+        version = versions.find_one({"_id": "books"}) or {}
+        return version.get("count", 0)
+
+    # ETag of the current version of the book collection
+    def books_etag():
+        return hashlib.blake2b(str(books_version()).encode(), digest_size=8).hexdigest()
+
+    # Answer with 304 when the client already holds the current version;
+    # clients must revalidate, so a read after a write always sees the change.
+    # The ETag is kept in g.books_etag: cached bodies are keyed by it, so a
+    # body is never served under the tag of another version
+    def conditional(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = g.books_etag = books_etag()
+            if etag in request.if_none_match:
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+
+    # Encoded GET /api/books payload of one collection version, shared by all requests:
+    # (etag, time the query started, payload)
+    books_payload = (None, 0.0, b"")
+    books_payload_lock = threading.Lock()
+
+    def books_payload_current(etag):
+        return books_payload[0] == etag and time.monotonic() - books_payload[1] < BOOKS_PAYLOAD_MAX_AGE
+
+    # Single-flight: concurrent requests for the same version wait for one query
+    # instead of each running their own; the payload is reused until the next write
+    # or until it is BOOKS_PAYLOAD_MAX_AGE old
+    def get_books_payload(etag):
+        nonlocal books_payload
+        if books_payload_current(etag):
+            return books_payload[2]
+        with books_payload_lock:
+            if not books_payload_current(etag):
+                started = time.monotonic()
+                books_payload = (etag, started, orjson.dumps(find_all_api_books(collection, api_books_projection)))
+            return books_payload[2]
+
+    @app.before_request
+    def log_request_info():
+        # Lazy %-style arguments: nothing is formatted unless INFO is enabled
+        app.logger.info("Request: %s %s", request.method, request.url)
+
+    @app.route("/")
+    def index():
+        return render_template("index.html")
+
+    @app.route("/books")
+    def books():
+        # Render rows as the cursor delivers them, sending ~100 template events per chunk,
+        # with the same context processors and request context as render_template
+        context = {"books": find_all_books(collection, books_projection)}
+        app.update_template_context(context)
+        stream = app.jinja_env.get_template("book-table.html").stream(context)
+        stream.enable_buffering(100)
+        return Response(stream_with_context(stream), mimetype="text/html")
+
+    @app.route("/authors")
+    @conditional
+    @cache.cached(timeout=300, key_prefix=lambda: f"authors:{g.books_etag}")
+    def authors():
+        return render_template("authors.html", authors=find_distinct_sorted(collection, "BookAuthor"))
+
+    @app.route("/years")
+    @conditional
+    @cache.cached(timeout=300, key_prefix=lambda: f"years:{g.books_etag}")
+    def years():
+        return render_template("years.html", years=find_distinct_sorted(collection, "BookYear"))
+
+    @app.route("/search")
+    def search():
+        return render_template("search-bar.html")
+
+    @app.route("/api/books", methods=["GET"])
+    @conditional
+    def api_books():
+        return Response(get_books_payload(g.books_etag), mimetype="application/json")
+
+    @app.route("/api/books", methods=["POST"])
+    def create_book():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            abort(400, description="Invalid JSON body.")
+
+        missing = schema.required - data.keys()
+        if missing:
+            return make_response({"error": f"Missing field(s): {', '.join(sorted(missing))}"}, 400)
+
+        # Optional fields default to ""
+        book = {field: data.get(key, "") for key, field in schema.fields}
+
+        # The unique index rejects duplicates atomically
+        try:
+            result = collection.insert_one(book)
+        except DuplicateKeyError:
+            return make_response({"error": f"Book with this {unique_key} already exists."}, 409)
+
+        books_changed()
+        book_id = data[path_key] if path_key else str(result.inserted_id)
+        return make_response({"message": "Book created successfully.", "id": book_id}, 201)
+
+    @app.route("/api/books/<string:book_id>", methods=["UPDATE", "PUT"])
+    def update_book(book_id):
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            abort(400, description="Invalid JSON body.")
+
+        # The field addressed by the path identifies the book and cannot be updated
+        update_fields = {field: data[key] for key, field in schema.fields if key in data and field != schema.path_field}
+
+        if not update_fields:
+            abort(400, description="No valid fields to update")
+
+        if path_key in data and data[path_key] != book_id:
+            abort(400, description="Book ID cannot be changed.")
+
+        # Update the single book addressed by book_id with update_fields
+        try:
+            result = collection.update_one(book_filter(book_id), {"$set": update_fields})
+        except DuplicateKeyError:
+            return make_response({"error": f"Book with this {unique_key} already exists."}, 409)
+
+        if result.matched_count == 0:
+            abort(404, description="Book not found.")
+
+        books_changed()
+        return make_response({"message": "Book updated successfully."}, 200)
+
+    @app.route("/api/books/<string:book_id>", methods=["DELETE"])
+    def delete_book(book_id):
+        # Delete just the book addressed by book_id
+        result = collection.delete_one(book_filter(book_id))
+
+        if result.deleted_count == 0:
+            return make_response({"error": "Book not found"}, 404)
+
+        books_changed()
+        return make_response({"message": f"Deleted {result.deleted_count} book(s) with ID '{book_id}'"}, 200)
+
+    return app
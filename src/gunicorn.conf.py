@@ -0,0 +1,24 @@
+# Gunicorn configuration for the book store (cmd/test.py).
+# Run from the directory containing this file: gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cmd")
+wsgi_app = "test:bootstrap()"
+
+bind = os.getenv("BIND", "0.0.0.0:3030")
+# Each worker has its own view cache (SimpleCache). That is safe with several
+# workers because cached views are keyed by the collection version stored in
+# MongoDB: a write in one worker moves every worker to new cache keys.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# gevent workers multiplex many concurrent requests, each waiting on MongoDB,
+# inside one process.
+worker_class = "gevent"
+worker_connections = 1000
+
+# Do not preload: the MongoClient must be created in each worker after the fork.
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
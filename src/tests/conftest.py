@@ -0,0 +1,32 @@
+import os
+import sys
+
+import mongomock
+import pytest
+
+# The app modules import each other by module name from cmd/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "cmd"))
+
+from app import create_app, id_schema, isbn_schema  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return mongomock.MongoClient()
+
+
+# Builds an app on the in-memory client. mongomock cannot run the seeding
+# bulk_write, so the schema's start data is inserted directly instead.
+@pytest.fixture
+def make_app(client):
+    def make(schema=id_schema, db_name="books", seed=True):
+        collection = client[db_name]["information"]
+        if seed and collection.count_documents({}) == 0:
+            collection.insert_many([dict(book) for book in schema.start_data])
+        return create_app(None, db_name=db_name, client=client, schema=schema, seed=False)
+    return make
+
+
+@pytest.fixture
+def isbn_app(make_app):
+    return make_app(schema=isbn_schema, db_name="exercise-2")
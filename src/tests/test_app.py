@@ -0,0 +1,125 @@
+import logging
+import time
+
+import pytest
+
+from logging.handlers import QueueHandler
+
+from app import BOOKS_PAYLOAD_MAX_AGE, create_app
+
+
+def test_api_books_lists_seeded_books_in_api_shape(make_app):
+    api = make_app().test_client()
+
+    response = api.get("/api/books")
+
+    assert response.status_code == 200
+    books = response.get_json()
+    assert {book["id"] for book in books} == {"example1", "example2", "example3"}
+    assert set(books[0]) == {"id", "title", "author", "edition", "pages", "year"}
+
+
+def test_create_update_delete_by_id(make_app):
+    api = make_app().test_client()
+    book = {"id": "new", "title": "Title", "author": "Author"}
+
+    assert api.post("/api/books", json=book).status_code == 201
+    assert api.post("/api/books", json=book).status_code == 409
+    assert api.put("/api/books/new", json={"title": "Changed"}).status_code == 200
+    assert [b["title"] for b in api.get("/api/books").get_json() if b["id"] == "new"] == ["Changed"]
+    assert api.put("/api/books/new", json={"id": "other"}).status_code == 400
+    assert api.delete("/api/books/new").status_code == 200
+    assert api.delete("/api/books/new").status_code == 404
+
+
+def test_invalid_bodies_are_rejected(make_app):
+    api = make_app().test_client()
+
+    assert api.post("/api/books", json={"id": "x"}).status_code == 400
+    assert api.post("/api/books", json=["x"]).status_code == 400
+    assert api.put("/api/books/example1", json="title").status_code == 400
+    assert api.post("/api/books", data=b"x" * (17 * 1024), content_type="application/json").status_code == 413
+
+
+def test_unchanged_collection_answers_304(make_app):
+    api = make_app().test_client()
+    etag = api.get("/authors").headers["ETag"]
+
+    assert api.get("/authors", headers={"If-None-Match": etag}).status_code == 304
+    api.post("/api/books", json={"id": "new", "title": "Title", "author": "Author"})
+    assert api.get("/authors", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_api_books_sees_writes_that_bypass_the_api(make_app, client):
+    api = make_app().test_client()
+    api.get("/api/books")
+
+    client["books"]["information"].insert_one({"ID": "direct", "BookName": "Direct", "BookAuthor": "Author"})
+    time.sleep(BOOKS_PAYLOAD_MAX_AGE)
+
+    assert "direct" in {book["id"] for book in api.get("/api/books").get_json()}
+
+
+def test_books_table_is_streamed_in_buffered_chunks(make_app, client):
+    client["books"]["information"].insert_many(
+        [{"ID": f"book{i}", "BookName": f"Title {i}", "BookAuthor": "Author"} for i in range(1000)]
+    )
+    api = make_app(seed=False).test_client()
+
+    chunks = list(api.get("/books").response)
+
+    assert 1 < len(chunks) < 200
+    assert b"".join(chunks).count(b"Title ") == 1000
+
+
+def test_duplicate_keys_stop_startup_with_a_clear_message(client):
+    client["books"]["information"].insert_many([{"ID": "twice"}, {"ID": "twice"}])
+
+    with pytest.raises(SystemExit, match="unique index on 'ID'"):
+        create_app(None, db_name="books", client=client, seed=False)
+
+
+def test_json_falls_back_for_values_orjson_rejects(make_app):
+    app = make_app()
+
+    with app.app_context():
+        assert app.json.loads(app.json.dumps({1: "a"})) == {"1": "a"}
+        assert app.json.response({2: "b"}).get_json() == {"2": "b"}
+        assert app.json.dumps({"b": 1, "a": 2}, indent=2) == '{\n  "a": 2,\n  "b": 1\n}'
+
+
+def test_workers_do_not_serve_stale_cached_views(make_app):
+    writer = make_app().test_client()
+    reader = make_app().test_client()
+    before = reader.get("/authors")
+
+    writer.post("/api/books", json={"id": "new", "title": "Title", "author": "Zed"})
+    after = reader.get("/authors")
+
+    assert b"Zed" not in before.data
+    assert b"Zed" in after.data
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_isbn_schema_serves_existing_collection(isbn_app):
+    api = isbn_app.test_client()
+    book = {"BookName": "B", "BookAuthor": "A", "BookISBN": "1-2-3", "BookPages": 10, "BookYear": 2000}
+
+    books = api.get("/api/books").get_json()
+    assert len(books) == 3 and all(isinstance(b["_id"], str) for b in books)
+
+    created = api.post("/api/books", json=book)
+    assert created.status_code == 201
+    book_id = created.get_json()["id"]
+    assert api.post("/api/books", json=book).status_code == 409
+    assert api.put(f"/api/books/{book_id}", json={"BookISBN": "958-30-0804-4"}).status_code == 409
+    assert api.put("/api/books/not-an-id", json={"BookName": "X"}).status_code == 400
+    assert api.delete(f"/api/books/{book_id}").status_code == 200
+
+
+def test_logging_is_attached_once(make_app):
+    make_app()
+    make_app()
+
+    handlers = logging.getLogger("app").handlers
+    assert sum(isinstance(handler, QueueHandler) for handler in handlers) == 1